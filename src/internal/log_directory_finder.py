@@ -1,9 +1,10 @@
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import functools
 import json
 import os
 import re
 import platform
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Tuple
 
 from ..utils.logging_setup import get_logger
 from ..utils.utils import Utils
@@ -32,9 +33,15 @@ class LogDirectoryFinder:
         r'tmp'
     ]
     
+    # All log patterns fused into one case-insensitive regex
+    _LOG_PATTERN_RE = re.compile('|'.join(LOG_PATTERNS), re.IGNORECASE)
+    
     # Common log file extensions (using FileHandler's extended list)
     LOG_EXTENSIONS = FileHandler.LOG_EXTENSIONS
     
+    # Lower-cased extensions as a tuple, usable directly with str.endswith
+    _LOG_EXT_TUPLE = tuple(ext.lower() for ext in LOG_EXTENSIONS)
+    
     # Directories to skip (system directories, etc.)
     SKIP_DIRS = {
         'node_modules',
@@ -75,27 +82,63 @@ class LogDirectoryFinder:
         'Application Data'  # Add this to prevent recursive Application Data directories
     }
     
+    # Lower-cased copy of SKIP_DIRS for case-insensitive O(1) name lookups
+    _SKIP_DIRS_LOWER = frozenset(skip_dir.lower() for skip_dir in SKIP_DIRS)
+    
+    # Matches any skip directory appearing inside a search term
+    _SKIP_DIRS_RE = re.compile('|'.join(re.escape(skip_dir) for skip_dir in sorted(_SKIP_DIRS_LOWER, key=len, reverse=True)))
+    
+    # All skip directories in one string, for testing whether a search term is part of any of them
+    _SKIP_DIRS_JOINED = '\0'.join(_SKIP_DIRS_LOWER)
+    
+    # Hidden directories that are still worth searching
+    _ALLOWED_HIDDEN_DIRS = frozenset({'.cache', '.config', '.local'})
+    
     # Cache file for custom log directories
     CACHE_FILE = os.path.join(os.path.expanduser('~'), '.protokoll', 'custom_log_dirs.json')
     
+    # Last loaded custom directories, keyed by the cache file's mtime
+    _custom_dirs_cache: Tuple[float, List[str]] = (-1, [])
+    
+    # Directory listings from previous searches, keyed by (base_dir, max_depth).
+    # Each entry is (path, lower-cased name, has log files, mtime).
+    _scan_cache: Dict[Tuple[str, int], Tuple[List[Tuple[str, str, bool, float]], int]] = {}
+    
     @staticmethod
     def _load_custom_directories() -> List[str]:
-        """Load custom log directories from cache file."""
+        """Load custom log directories from cache file, reusing the last parse if unchanged."""
+        try:
+            mtime = os.stat(LogDirectoryFinder.CACHE_FILE).st_mtime
+        except OSError:
+            return []
+        
+        cached_mtime, cached_dirs = LogDirectoryFinder._custom_dirs_cache
+        if mtime == cached_mtime:
+            return list(cached_dirs)
+        
         try:
-            if os.path.exists(LogDirectoryFinder.CACHE_FILE):
-                with open(LogDirectoryFinder.CACHE_FILE, 'r') as f:
-                    return json.load(f)
+            with open(LogDirectoryFinder.CACHE_FILE, 'r') as f:
+                directories = json.load(f)
+            LogDirectoryFinder._custom_dirs_cache = (mtime, directories)
+            return list(directories)
         except Exception as e:
             logger.error(f"Error loading custom directories: {str(e)}")
         return []
     
+    @staticmethod
+    def _invalidate_custom_directories() -> None:
+        """Force the next load to re-read the cache file."""
+        LogDirectoryFinder._custom_dirs_cache = (-1, [])
+    
     @staticmethod
     def _save_custom_directories(directories: List[str]) -> None:
-        """Save custom log directories to cache file."""
+        """Save custom log directories to cache file, replacing it atomically."""
         try:
             os.makedirs(os.path.dirname(LogDirectoryFinder.CACHE_FILE), exist_ok=True)
-            with open(LogDirectoryFinder.CACHE_FILE, 'w') as f:
-                json.dump(directories, f, indent=2)
+            tmp_file = LogDirectoryFinder.CACHE_FILE + '.tmp'
+            with open(tmp_file, 'w') as f:
+                json.dump(directories, f, separators=(',', ':'))
+            os.replace(tmp_file, LogDirectoryFinder.CACHE_FILE)
         except Exception as e:
             logger.error(f"Error saving custom directories: {str(e)}")
     
@@ -129,6 +172,7 @@ class LogDirectoryFinder:
             
             # Save updated list
             LogDirectoryFinder._save_custom_directories(custom_dirs)
+            LogDirectoryFinder._invalidate_custom_directories()
             
             return True, f"Added custom directory: {directory}"
             
@@ -159,6 +203,7 @@ class LogDirectoryFinder:
             
             # Save updated list
             LogDirectoryFinder._save_custom_directories(custom_dirs)
+            LogDirectoryFinder._invalidate_custom_directories()
             
             return True, f"Removed custom directory: {directory}"
             
@@ -176,8 +221,9 @@ class LogDirectoryFinder:
         return LogDirectoryFinder._load_custom_directories()
     
     @staticmethod
-    def get_app_data_directories() -> List[str]:
-        """Get the application data directories for the current OS."""
+    @functools.lru_cache(maxsize=1)
+    def get_app_data_directories() -> Tuple[str, ...]:
+        """Get the application data directories for the current OS (computed once per process)."""
         app_data_dirs = []
         
         if platform.system() == 'Windows':
@@ -206,7 +252,7 @@ class LogDirectoryFinder:
             ])
         
         # Filter out non-existent directories
-        return [d for d in app_data_dirs if os.path.exists(d)]
+        return tuple(d for d in app_data_dirs if os.path.exists(d))
     
     @staticmethod
     def validate_search_query(app_name: str) -> Tuple[bool, str]:
@@ -224,13 +270,24 @@ class LogDirectoryFinder:
         
         app_name_lower = app_name.lower()
         
-        # Check if the app name matches any system directory
-        for skip_dir in LogDirectoryFinder.SKIP_DIRS:
-            if skip_dir.lower() in app_name_lower or app_name_lower in skip_dir.lower():
-                return False, f"Search term '{app_name}' matches system directory '{skip_dir}'. Please use manual directory selection."
+        # Check if the app name matches any system directory, either exactly,
+        # by containing one, or by being contained in one
+        if (app_name_lower in LogDirectoryFinder._SKIP_DIRS_LOWER
+                or LogDirectoryFinder._SKIP_DIRS_RE.search(app_name_lower)
+                or app_name_lower in LogDirectoryFinder._SKIP_DIRS_JOINED):
+            skip_dir = LogDirectoryFinder._find_matching_skip_dir(app_name_lower)
+            return False, f"Search term '{app_name}' matches system directory '{skip_dir}'. Please use manual directory selection."
         
         return True, ""
 
+    @staticmethod
+    def _find_matching_skip_dir(app_name_lower: str) -> str:
+        """Find the SKIP_DIRS entry that caused a search term to be rejected."""
+        for skip_dir in LogDirectoryFinder.SKIP_DIRS:
+            if skip_dir.lower() in app_name_lower or app_name_lower in skip_dir.lower():
+                return skip_dir
+        return app_name_lower
+
     @staticmethod
     def find_log_directories(app_name: str, max_depth: int = 3) -> Dict[str, List[str]]:
         """Refactored directory search with clear exact/potential match separation."""
@@ -245,149 +302,282 @@ class LogDirectoryFinder:
         app_name_lower = app_name.lower()
         exact_matches = set()
         potential_matches = set()
-        dirs_checked = 0
-        dirs_skipped = 0
 
         # Define base directories to search
         base_dirs = (
             LogDirectoryFinder.get_custom_directories() +
-            LogDirectoryFinder.get_app_data_directories()
+            list(LogDirectoryFinder.get_app_data_directories())
         )
         if platform.system() == 'Windows':
             base_dirs.extend([
                 os.path.expandvars('%ProgramFiles%'),
                 os.path.expandvars('%ProgramFiles(x86)%')
             ])
+        base_dirs = [d for d in base_dirs if os.path.exists(d)]
 
         # 1. Search for exact matches
         logger.info(f"Searching for exact matches: {app_name}")
-        for base_dir in base_dirs:
-            if not os.path.exists(base_dir):
-                continue
-                
-            for root, dirs, files in os.walk(base_dir):
-                # Update skip counters
-                new_dirs = []
-                for d in dirs:
-                    full_path = os.path.join(root, d)
-                    if LogDirectoryFinder._should_skip(full_path, base_dir, max_depth):
-                        dirs_skipped += 1
-                    else:
-                        new_dirs.append(d)
-                dirs[:] = new_dirs
-                
-                # Process current directory
-                dirs_checked += 1
-                dir_name = os.path.basename(root).lower()
-                
-                # Check exact match
-                if dir_name == app_name_lower:
-                    if LogDirectoryFinder._has_log_files(root, max_depth):
-                        exact_matches.add(root)
-                        logger.info(f"Found exact match: {root}")
-        
-        # Return early if exact matches found
+        pending_exact, dirs_skipped = LogDirectoryFinder._search_base_dirs(
+            base_dirs, lambda dir_path, dir_name_lower: dir_name_lower == app_name_lower, max_depth)
+        
+        for root, has_logs in pending_exact.items():
+            if has_logs:
+                exact_matches.add(root)
+                logger.info(f"Found exact match: {root}")
+        
         if exact_matches:
             logger.info(f"Found {len(exact_matches)} exact matches")
-            return {
-                'exact_matches': sorted(exact_matches),
-                'potential_matches': []
-            }
-
-        # 2. Search for potential matches
-        logger.info("No exact matches found, searching for potential matches")
-        for base_dir in base_dirs:
-            if not os.path.exists(base_dir):
-                continue
-                
-            for root, dirs, files in os.walk(base_dir):
-                # Update skip counters
-                new_dirs = []
-                for d in dirs:
-                    full_path = os.path.join(root, d)
-                    if LogDirectoryFinder._should_skip(full_path, base_dir, max_depth):
-                        dirs_skipped += 1
-                    else:
-                        new_dirs.append(d)
-                dirs[:] = new_dirs
-                
-                # Process current directory
-                dirs_checked += 1
-                
-                # Check potential candidate
-                if LogDirectoryFinder._is_potential_candidate(root, app_name_lower):
-                    if LogDirectoryFinder._has_log_files(root, max_depth):
-                        potential_matches.add(root)
-                        logger.info(f"Found potential match: {root}")
-                    else:
-                        logger.info(f"No log files found in potential match: {root}")
+        else:
+            # 2. Search for potential matches
+            logger.info("No exact matches found, searching for potential matches")
+            pending_potential, potential_skipped = LogDirectoryFinder._search_base_dirs(
+                base_dirs,
+                lambda dir_path, dir_name_lower: LogDirectoryFinder._is_potential_candidate(
+                    dir_path, dir_name_lower, app_name_lower),
+                max_depth)
+            dirs_skipped += potential_skipped
+            
+            for root, has_logs in pending_potential.items():
+                if has_logs:
+                    potential_matches.add(root)
+                    logger.info(f"Found potential match: {root}")
+                else:
+                    logger.info(f"No log files found in potential match: {root}")
+            
+            logger.info(f"Found {len(potential_matches)} potential matches")
 
         logger.info(f"Skipped {dirs_skipped} directories.")
 
-        # Return results
-        logger.info(f"Found {len(potential_matches)} potential matches")
+        # Return results, sorted once
         return {
             'exact_matches': sorted(exact_matches),
             'potential_matches': sorted(potential_matches)
         }
 
     @staticmethod
-    def _should_skip(dir_path: str, base_dir: str, max_depth: int) -> bool:
-        """Determine if directory should be skipped during traversal."""
-        try:
-            rel_path = os.path.relpath(dir_path, base_dir)
-            current_depth = rel_path.count(os.sep) if rel_path != '.' else 0
-            
-            # Skip based on depth
-            if current_depth > max_depth:
-                # logger.info("Skipped directory due to max depth condition: " + dir_path)
-                return True
-            
-            # Skip hidden/system directories
-            if any(part not in (".cache", ".config", ".local") and part.startswith('.') for part in dir_path.split(os.sep)):
-                # logger.info("Skipped directory due to hidden condition: " + dir_path)
-                return True
-                
-            # Skip special directories
-            if any(skip_dir in dir_path.split(os.sep) for skip_dir in LogDirectoryFinder.SKIP_DIRS):
-                # logger.info("Skipped directory due to user spec: " + dir_path)
-                return True
-                
-            return False
-        except Exception as e:
-            logger.error(f"Error checking directory {dir_path}: {str(e)}")
-            return True
+    def _search_base_dirs(base_dirs: List[str], is_match: Callable[[str, str], bool],
+                          max_depth: int) -> Tuple[Dict[str, bool], int]:
+        """
+        Search several base directories concurrently.
+        
+        Traversal is dominated by filesystem calls that release the GIL, so
+        each base directory gets its own worker thread.
+        
+        Returns:
+            Tuple of (matched directory -> has log files, directories skipped)
+        """
+        matches: Dict[str, bool] = {}
+        dirs_skipped = 0
+        if not base_dirs:
+            return matches, dirs_skipped
+        
+        with ThreadPoolExecutor(max_workers=len(base_dirs)) as executor:
+            futures = [
+                executor.submit(LogDirectoryFinder._search_base_dir, base_dir, is_match, max_depth)
+                for base_dir in base_dirs
+            ]
+            for future in as_completed(futures):
+                base_matches, base_skipped = future.result()
+                dirs_skipped += base_skipped
+                # Base directories may overlap, so keep any positive result
+                for root, has_logs in base_matches.items():
+                    matches[root] = matches.get(root, False) or has_logs
+        
+        return matches, dirs_skipped
+
+    @staticmethod
+    def _search_base_dir(base_dir: str, is_match: Callable[[str, str], bool],
+                         max_depth: int) -> Tuple[Dict[str, bool], int]:
+        """
+        Collect directories under base_dir accepted by is_match, which is
+        called with each directory's path and lower-cased name.
+        
+        Returns:
+            Tuple of (matched directory -> has log files, directories skipped)
+        """
+        entries, dirs_skipped = LogDirectoryFinder._scan_base_dir(base_dir, max_depth)
+        
+        pending: Dict[str, bool] = {
+            path: False for path, name_lower, _, _ in entries if is_match(path, name_lower)
+        }
+        
+        # Credit log files to matched ancestors until every match is resolved
+        unresolved = len(pending)
+        if unresolved:
+            _mark_log_ancestors = LogDirectoryFinder._mark_log_ancestors
+            for path, _, has_log_files, _ in entries:
+                if has_log_files:
+                    unresolved -= _mark_log_ancestors(path, base_dir, pending)
+                    if not unresolved:
+                        break
+        
+        # The walk stops at max_depth and skips system/hidden directories, so
+        # probe the full subtree of any match it could not resolve
+        if unresolved:
+            _has_log_files = LogDirectoryFinder._has_log_files
+            for path, has_logs in pending.items():
+                if not has_logs and _has_log_files(path, max_depth):
+                    pending[path] = True
+        
+        return pending, dirs_skipped
 
     @staticmethod
     def _has_log_files(directory: str, max_depth: int) -> bool:
-        """Check if directory contains log files using BFS with depth limit."""
-        queue = deque([(directory, 0)])
-        while queue:
-            current_dir, depth = queue.popleft()
+        """Check if directory contains log files, searching up to max_depth levels below it."""
+        _scandir = os.scandir
+        log_exts = LogDirectoryFinder._LOG_EXT_TUPLE
+        
+        stack = [(directory, 0)]
+        while stack:
+            current_dir, depth = stack.pop()
             try:
-                for entry in os.listdir(current_dir):
-                    entry_path = os.path.join(current_dir, entry)
-                    if os.path.isfile(entry_path):
-                        if any(entry.lower().endswith(ext) for ext in LogDirectoryFinder.LOG_EXTENSIONS):
-                            return True
-                    elif os.path.isdir(entry_path) and depth < max_depth:
-                        queue.append((entry_path, depth + 1))
-            except PermissionError:
+                with _scandir(current_dir) as it:
+                    for entry in it:
+                        try:
+                            if entry.is_file():
+                                if entry.name.lower().endswith(log_exts):
+                                    return True
+                            elif depth < max_depth and entry.is_dir():
+                                stack.append((entry.path, depth + 1))
+                        except OSError:
+                            continue
+            except OSError:
                 continue
         return False
 
     @staticmethod
-    def _is_potential_candidate(dir_path: str, app_name_lower: str) -> bool:
-        """Determine if directory is a potential log directory candidate."""
-        dir_name = os.path.basename(dir_path).lower()
-        dir_path_lower = dir_path.lower()
+    def _scan_base_dir(base_dir: str, max_depth: int) -> Tuple[List[Tuple[str, str, bool, float]], int]:
+        """
+        List the searchable directories under base_dir.
+        
+        Listings are cached across searches and reused as long as none of
+        the listed directories' mtimes have changed, which costs one stat
+        per directory instead of a full walk.
+        
+        Returns:
+            Tuple of ([(path, lower-cased name, has log files, mtime)], directories skipped)
+        """
+        key = (base_dir, max_depth)
+        cached = LogDirectoryFinder._scan_cache.get(key)
+        if cached is not None and LogDirectoryFinder._is_scan_current(cached[0]):
+            return cached
+        
+        # Bind hot-loop lookups to locals
+        _scandir = os.scandir
+        _should_skip = LogDirectoryFinder._should_skip
+        log_exts = LogDirectoryFinder._LOG_EXT_TUPLE
+        
+        entries: List[Tuple[str, str, bool, float]] = []
+        dirs_skipped = 0
+        try:
+            base_mtime = os.stat(base_dir).st_mtime
+        except OSError:
+            return entries, dirs_skipped
+        
+        # Depth-first walk carrying each directory's (path, lower-cased name,
+        # depth of its subdirectories relative to base_dir, mtime)
+        stack = [(base_dir, os.path.basename(base_dir).lower(), 0, base_mtime)]
+        while stack:
+            path, name_lower, child_depth, mtime = stack.pop()
+            has_log_files = False
+            try:
+                with _scandir(path) as it:
+                    for entry in it:
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        
+                        if not is_dir:
+                            if not has_log_files and entry.name.lower().endswith(log_exts):
+                                has_log_files = True
+                            continue
+                        
+                        if child_depth > max_depth:
+                            dirs_skipped += 1
+                            continue
+                        entry_name_lower = entry.name.lower()
+                        if _should_skip(entry_name_lower):
+                            dirs_skipped += 1
+                            continue
+                        try:
+                            entry_mtime = entry.stat(follow_symlinks=False).st_mtime
+                        except OSError:
+                            continue
+                        stack.append((entry.path, entry_name_lower, child_depth + 1, entry_mtime))
+            except OSError:
+                continue
+            
+            entries.append((path, name_lower, has_log_files, mtime))
         
+        result = (entries, dirs_skipped)
+        LogDirectoryFinder._scan_cache[key] = result
+        return result
+
+    @staticmethod
+    def _is_scan_current(entries: List[Tuple[str, str, bool, float]]) -> bool:
+        """Check that no directory in a cached listing has changed since it was scanned."""
+        _stat = os.stat
+        try:
+            for path, _, _, mtime in entries:
+                if _stat(path).st_mtime != mtime:
+                    return False
+        except OSError:
+            return False
+        return True
+
+    @staticmethod
+    def _should_skip(dir_name_lower: str) -> bool:
+        """
+        Determine if directory should be skipped during traversal.
+        
+        Only the directory's own (lower-cased) name is checked against the
+        hidden/skip lists, since its ancestors were already filtered by the walk.
+        """
+        # Skip hidden/system directories
+        if dir_name_lower.startswith('.') and dir_name_lower not in LogDirectoryFinder._ALLOWED_HIDDEN_DIRS:
+            return True
+        
+        # Skip special directories
+        return dir_name_lower in LogDirectoryFinder._SKIP_DIRS_LOWER
+
+    @staticmethod
+    def _mark_log_ancestors(dir_path: str, base_dir: str, pending: Dict[str, bool]) -> int:
+        """
+        Mark dir_path and each of its ancestors up to base_dir that is pending as having log files.
+        
+        Returns:
+            Number of pending entries newly marked
+        """
+        marked = 0
+        path = dir_path
+        while True:
+            if pending.get(path) is False:
+                pending[path] = True
+                marked += 1
+            if len(path) <= len(base_dir):
+                break
+            parent = os.path.dirname(path)
+            if parent == path:
+                break
+            path = parent
+        return marked
+
+    @staticmethod
+    def _is_potential_candidate(dir_path: str, dir_name_lower: str, app_name_lower: str) -> bool:
+        """Determine if directory is a potential log directory candidate."""
         # Match log patterns and app name in path
-        if any(re.search(pattern, dir_name, re.IGNORECASE) for pattern in LogDirectoryFinder.LOG_PATTERNS):
-            return app_name_lower in dir_path_lower
+        if LogDirectoryFinder._LOG_PATTERN_RE.search(dir_name_lower):
+            return app_name_lower in dir_path.lower()
         
         # Check string similarity for longer names
-        if len(app_name_lower) > 6 and len(dir_name) > 6:
-            return Utils.is_similar_strings(dir_name, app_name_lower)
+        if len(app_name_lower) > 6 and len(dir_name_lower) > 6:
+            return LogDirectoryFinder._is_similar_name(dir_name_lower, app_name_lower)
         
         return False
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _is_similar_name(dir_name: str, app_name_lower: str) -> bool:
+        """Memoized similarity check, since the same directory names recur across base directories."""
+        return Utils.is_similar_strings(dir_name, app_name_lower)
@@ -526,7 +526,7 @@ class MainWindow(QMainWindow):
         self.log_viewer.append("\n")
         
         # Read file content safely
-        success, content, read_info = self.file_handler.read_file_safe(file_path)
+        success, content, read_info = self.file_handler.read_file_safe(file_path, file_info=file_info)
         
         if not success:
             self.append_styled_content(f"❌ Error reading file: {read_info.get('error', 'Unknown error')}", color=ThemeManager.DARK_THEME["log_viewer"]["error"])
@@ -643,7 +643,7 @@ class MainWindow(QMainWindow):
             return
         
         # Read file content safely
-        success, content, read_info = self.file_handler.read_file_safe(log_file_path)
+        success, content, read_info = self.file_handler.read_file_safe(log_file_path, file_info=file_info)
         
         if not success:
             self.log_viewer.clear()
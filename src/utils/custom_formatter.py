@@ -7,7 +7,7 @@ class CustomFormatter(logging.Formatter):
     red = "\x1b[31;20m"
     bold_red = "\x1b[31;1m"
     reset = "\x1b[0m"
-    format = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"  # (%(filename)s:%(lineno)d)
+    format = "{asctime} - {name} - {levelname} - {message}"  # ({filename}:{lineno})
 
     FORMATS = {
         logging.DEBUG: grey + format + reset,
@@ -17,7 +17,12 @@ class CustomFormatter(logging.Formatter):
         logging.CRITICAL: bold_red + format + reset
     }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Build the per-level formatters once instead of for every record
+        self._formatters = {level: logging.Formatter(log_fmt, style='{') for level, log_fmt in self.FORMATS.items()}
+        self._default_formatter = logging.Formatter()
+
     def format(self, record):
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
+        formatter = self._formatters.get(record.levelno, self._default_formatter)
         return formatter.format(record)
\ No newline at end of file
@@ -1,12 +1,21 @@
 import os
-import gzip
+import codecs
 import bz2
+import functools
+import stat
 import zipfile
 import chardet
 import sys
+import threading
 import warnings
-from pathlib import Path
-from typing import Optional, Tuple, Dict, Any, Union
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, Dict, Any, List, Union
+
+try:
+    from isal import igzip as gzip  # Optional drop-in with SIMD-accelerated inflate
+except ImportError:
+    import gzip
 
 from .logging_setup import get_logger
 
@@ -32,15 +41,15 @@ class FileHandler:
     """
     
     # Extended log file extensions
-    LOG_EXTENSIONS = [
+    LOG_EXTENSIONS = frozenset({
         '.log', '.txt', '.csv', '.json', '.xml', 
         '.yaml', '.yml', '.ini', '.conf', '.cfg',
         '.out', '.err', '.trace', '.dump',
         '.gz', '.bz2', '.zip'
-    ]
+    })
     
     # Compression extensions
-    COMPRESSED_EXTENSIONS = ['.gz', '.bz2', '.zip']
+    COMPRESSED_EXTENSIONS = frozenset({'.gz', '.bz2', '.zip'})
     
     # File size limits (100MB max, 10MB warning)
     MAX_FILE_SIZE = 100 * 1024 * 1024
@@ -48,20 +57,36 @@ class FileHandler:
     
     # Sample size for detection (4KB optimized for chunk size)
     DETECTION_SAMPLE_SIZE = 4096
+    
+    # Chunk size for streaming reads (128KB fits in L2 and beats 8KB buffers)
+    READ_CHUNK_SIZE = 128 * 1024
+    
+    # Units for _format_size, each 1024 times the previous
+    _SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+    
+    # Bytes counted as printable text: tab, newline, carriage return and ASCII 32-126
+    _PRINTABLE_BYTES = bytes([9, 10, 13, *range(32, 127)])
+    
+    # get_file_info results for unchanged files, most recently used last
+    INFO_CACHE_SIZE = 1024
+    _info_cache: "OrderedDict[str, Tuple[Tuple[int, int, int, int], Dict[str, Any]]]" = OrderedDict()
+    _info_cache_lock = threading.Lock()
 
     def __init__(self):
         # Removed python-magic dependency
         pass
     
     @classmethod
+    @functools.lru_cache(maxsize=4096)
     def is_log_file(cls, file_path: str) -> bool:
         """Check if file has a log-like extension."""
-        return bool(Path(file_path).suffix.lower() in cls.LOG_EXTENSIONS)
+        return os.path.splitext(file_path)[1].lower() in cls.LOG_EXTENSIONS
  
     @classmethod
+    @functools.lru_cache(maxsize=4096)
     def is_compressed(cls, file_path: str) -> bool:
         """Check if file is compressed."""
-        return bool(Path(file_path).suffix.lower() in cls.COMPRESSED_EXTENSIONS)
+        return os.path.splitext(file_path)[1].lower() in cls.COMPRESSED_EXTENSIONS
     
     def _lock_file(self, file_obj):
         """Apply file locking appropriate for the OS."""
@@ -85,25 +110,43 @@ class FileHandler:
         except (IOError, OSError):
             pass
 
-    def get_file_info(self, file_path: str) -> Dict[str, Any]:
-        """Get comprehensive file information with optimizations."""
-        path = Path(file_path)
-        if not path.exists():
-            return {"error": "File does not exist"}
+    def get_file_info(self, file_path: str, stat_result: Optional[os.stat_result] = None) -> Dict[str, Any]:
+        """
+        Get comprehensive file information with optimizations.
+        
+        Args:
+            file_path: Path to the file
+            stat_result: Result of os.stat(file_path) if the caller already has one
+            
+        Returns:
+            Dictionary of file information, or {"error": ...} on failure
+        """
+        if stat_result is None:
+            try:
+                stat_result = os.stat(file_path)
+            except OSError:
+                return {"error": "File does not exist"}
+        
+        # Any write, truncation, replacement or permission change alters this key
+        cache_key = (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino, stat_result.st_mode)
+        with self._info_cache_lock:
+            cached = self._info_cache.get(file_path)
+            if cached is not None and cached[0] == cache_key:
+                self._info_cache.move_to_end(file_path)
+                return self._copy_info(cached[1])
         
         try:
-            stat = path.stat()
-            file_size = stat.st_size
+            file_size = stat_result.st_size
             
             info = {
-                "path": str(path.resolve()),
+                "path": os.path.realpath(file_path),
                 "size": file_size,
                 "size_human": self._format_size(file_size),
-                "is_file": path.is_file(),
+                "is_file": stat.S_ISREG(stat_result.st_mode),
                 "is_compressed": self.is_compressed(file_path),
                 "is_log_file": self.is_log_file(file_path),
-                "extension": path.suffix.lower(),
-                "last_modified": stat.st_mtime,
+                "extension": os.path.splitext(file_path)[1].lower(),
+                "last_modified": stat_result.st_mtime,
                 "readable": os.access(file_path, os.R_OK),
                 "warnings": []
             }
@@ -114,83 +157,93 @@ class FileHandler:
             elif file_size > self.WARN_FILE_SIZE:
                 info["warnings"].append(f"Large file ({info['size_human']})")
             
-            # Binary detection
+            # Binary detection; a failed sample read may be transient, so
+            # only cache the result when the read succeeded
+            cacheable = True
             if info["is_file"] and info["readable"]:
                 try:
-                    with open(file_path, 'rb') as f:
-                        sample = f.read(self.DETECTION_SAMPLE_SIZE)
-                        info["is_binary"] = self._is_binary_sample(sample)
-                        info["sample"] = sample  # Store for later use
+                    # Unbuffered read: one syscall, no BufferedReader for a single 4KB read
+                    fd = os.open(file_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+                    try:
+                        sample = os.read(fd, self.DETECTION_SAMPLE_SIZE)
+                    finally:
+                        os.close(fd)
+                    info["is_binary"] = self._is_binary_sample(sample)
+                    if not info["is_binary"]:
+                        # Detect now, while the sample is at hand, rather than keeping it
+                        info["encoding"] = self._detect_encoding(sample)
                 except Exception as e:
-                    logger.error(f"Binary detection failed: {str(e)}")
+                    logger.error("Binary detection failed: %s", e)
                     info["is_binary"] = True
                     info["warnings"].append("Binary detection failed")
+                    cacheable = False
                 
                 if info.get("is_binary", False):
                     info["warnings"].append("File may contain corrupted data or non-text content")
             
+            if cacheable:
+                with self._info_cache_lock:
+                    self._info_cache[file_path] = (cache_key, self._copy_info(info))
+                    self._info_cache.move_to_end(file_path)
+                    if len(self._info_cache) > self.INFO_CACHE_SIZE:
+                        self._info_cache.popitem(last=False)
+            
             return info
             
         except Exception as e:
-            logger.error(f"File info error: {str(e)}")
+            logger.error("File info error: %s", e)
             return {"error": str(e)}
 
-    def _get_printable_ratio(self, sample: bytes) -> float:
-        """Calculate the ratio of printable characters in a byte sample."""
-        if not sample:
-            return 1.0  # Empty sample is considered 100% printable
-        
-        printable = 0
-        for byte in sample:
-            # Consider tab, newline, carriage return as printable
-            if 32 <= byte <= 126 or byte in (9, 10, 13):
-                printable += 1
-        return printable / len(sample)
+    @staticmethod
+    def _copy_info(info: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy an info dict so callers can't modify a cached one."""
+        return dict(info, warnings=list(info["warnings"]))
 
     def _is_binary_sample(self, sample: bytes) -> bool:
         """Improved binary detection with null byte handling."""
         if not sample:
             return False
         
+        sample_size = len(sample)
+        
         # Check for consecutive null bytes which indicate binary
-        null_count = sample.count(b'\x00')
-        if null_count > len(sample) / 4:  # More than 25% null bytes
+        # (more than 25% null bytes)
+        if sample.count(b'\x00') * 4 > sample_size:
             return True
         
-        # Calculate printable ratio
-        printable_ratio = self._get_printable_ratio(sample)
-        
-        # Consider files with low printable ratio as binary
-        if printable_ratio < 0.65:
-            return True
-            
-        # Files with moderate null bytes but high printable ratio are text
-        return False
+        # Consider files with a low printable ratio (under 65%) as binary.
+        # Deleting every printable byte in one C-level pass leaves only the
+        # non-printable ones, compared as integers: nonprintable / size > 7 / 20.
+        nonprintable = len(sample.translate(None, self._PRINTABLE_BYTES))
+        return nonprintable * 20 > sample_size * 7
     
     def _format_size(self, size_bytes: int) -> str:
         """Human-readable file size."""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if size_bytes < 1024:
-                return f"{size_bytes:.1f}{unit}"
-            size_bytes /= 1024
-        return f"{size_bytes:.1f}TB"
+        # Each unit is 10 bits wider, so the bit length picks the unit directly
+        unit_index = min((size_bytes.bit_length() - 1) // 10, 4) if size_bytes > 0 else 0
+        return f"{size_bytes / (1 << (10 * unit_index)):.1f}{self._SIZE_UNITS[unit_index]}"
     
-    def read_file_safe(self, file_path: str, max_size: Optional[int] = None) -> Tuple[bool, Union[str, bytes], Dict[str, Any]]:
-        """Safe file reading with compression support and optimizations."""
+    def read_file_safe(self, file_path: str, max_size: Optional[int] = None,
+                       file_info: Optional[Dict[str, Any]] = None) -> Tuple[bool, Union[str, bytes], Dict[str, Any]]:
+        """
+        Safe file reading with compression support and optimizations.
+        
+        Args:
+            file_path: Path to the file
+            max_size: Maximum file size to read (defaults to MAX_FILE_SIZE)
+            file_info: Result of get_file_info for this file, if already computed
+            
+        Returns:
+            Tuple of (success, content, info)
+        """
         max_size = max_size or self.MAX_FILE_SIZE
-        file_info = self.get_file_info(file_path)
+        if file_info is None:
+            file_info = self.get_file_info(file_path)
         
         # Error handling
-        if "error" in file_info:
-            return False, "", file_info
-        if not file_info["is_file"]:
-            return False, "", {"error": "Not a file"}
-        if not file_info["readable"]:
-            return False, "", {"error": "Not readable"}
-        if file_info["size"] > max_size:
-            return False, "", {"error": f"Size exceeds limit ({file_info['size_human']})"}
-        if file_info.get("is_binary", False):
-            return False, "", {"error": "File may contain corrupted data or non-text content", "warnings": file_info["warnings"]}
+        error = self._check_readable(file_info, max_size)
+        if error is not None:
+            return False, "", error
         
         try:
             # Handle compressed files
@@ -198,58 +251,91 @@ class FileHandler:
                 content = self._read_compressed_file(file_path)
             # Handle text files
             else:
-                sample = file_info.get("sample", b"")
-                encoding = self._detect_encoding(sample)
+                encoding = file_info.get("encoding", "utf-8")
                 
                 # Read file with null byte handling
-                with open(file_path, 'rb') as f:
-                    raw_content = f.read()
-                    
-                    # Handle files with null bytes
-                    if b'\x00' in raw_content:
-                        # Replace null bytes with Unicode replacement character
-                        raw_content = raw_content.replace(b'\x00', b'\xef\xbf\xbd')
-                        content = raw_content.decode(encoding, errors='replace')
-                    else:
-                        content = raw_content.decode(encoding, errors='replace')
+                with open(file_path, 'rb', buffering=self.READ_CHUNK_SIZE) as f:
+                    self._hint_sequential(f.fileno(), file_info["size"])
+                    content = self._decode_stream(f, encoding)
             
             return True, content, file_info
             
         except UnicodeDecodeError as e:
             return False, "", {"error": f"Encoding error: {str(e)}"}
         except Exception as e:
-            logger.error(f"Read error: {str(e)}")
+            logger.error("Read error: %s", e)
             return False, "", {"error": str(e)}
 
+    @staticmethod
+    def _check_readable(file_info: Dict[str, Any], max_size: int) -> Optional[Dict[str, Any]]:
+        """Return the error info for a file that cannot be read as text, or None."""
+        if "error" in file_info:
+            return file_info
+        if not file_info["is_file"]:
+            return {"error": "Not a file"}
+        if not file_info["readable"]:
+            return {"error": "Not readable"}
+        if file_info["size"] > max_size:
+            return {"error": f"Size exceeds limit ({file_info['size_human']})"}
+        if file_info.get("is_binary", False):
+            return {"error": "File may contain corrupted data or non-text content", "warnings": file_info["warnings"]}
+        return None
+
+    @staticmethod
+    def _hint_sequential(fd: int, size: int) -> None:
+        """Tell the kernel a file will be read front to back, and start reading ahead."""
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        try:
+            os.posix_fadvise(fd, 0, size, os.POSIX_FADV_SEQUENTIAL)
+            os.posix_fadvise(fd, 0, min(size, 8 * 1024 * 1024), os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+
+    def _decode_stream(self, stream, encoding: str) -> str:
+        """
+        Decode a binary stream chunk by chunk, replacing null bytes.
+        
+        Avoids holding the raw bytes, a null-replaced copy and the decoded
+        text in memory all at once.
+        """
+        decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        parts = []
+        while True:
+            chunk = stream.read(self.READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            
+            # Replace null bytes with Unicode replacement character; replace()
+            # returns the chunk itself when there are none, so no separate probe
+            chunk = chunk.replace(b'\x00', b'\xef\xbf\xbd')
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b'', final=True))
+        return ''.join(parts)
+
     def _read_compressed_file(self, file_path: str) -> str:
         """Read compressed files with null byte handling."""
-        path = Path(file_path)
-        ext = path.suffix.lower()
+        ext = os.path.splitext(file_path)[1].lower()
         
         if ext == '.gz':
-            with gzip.open(file_path, 'rt', encoding='utf-8') as f:
-                return f.read()
+            with gzip.open(file_path, 'rb') as f:
+                return self._decode_stream(f, 'utf-8')
         
         elif ext == '.bz2':
-            with bz2.open(file_path, 'rt', encoding='utf-8') as f:
-                return f.read()
+            with bz2.open(file_path, 'rb') as f:
+                return self._decode_stream(f, 'utf-8')
         
         elif ext == '.zip':
             with zipfile.ZipFile(file_path, 'r') as zip_ref:
                 if not zip_ref.namelist():
                     raise ValueError("Empty zip archive")
                 
+                log_extensions = self.LOG_EXTENSIONS
                 for name in zip_ref.namelist():
-                    if self.is_log_file(name) and not name.endswith('/'):
+                    # Check members directly rather than through the memoized is_log_file
+                    if not name.endswith('/') and os.path.splitext(name)[1].lower() in log_extensions:
                         with zip_ref.open(name) as f:
-                            content = f.read()
-                            
-                            # Handle null bytes in zip content
-                            if b'\x00' in content:
-                                # Replace null bytes with replacement character
-                                content = content.replace(b'\x00', b'\xef\xbf\xbd')
-                                return content.decode('utf-8', errors='replace')
-                            return content.decode('utf-8', errors='replace')
+                            return self._decode_stream(f, 'utf-8')
                 
                 raise ValueError("No log files in zip")
         
@@ -276,6 +362,10 @@ class FileHandler:
         if sample.startswith(b'\xfe\xff'):
             return 'utf-16-be'
         
+        # Pure ASCII (the common case for logs) is valid UTF-8; checked in C
+        if sample.isascii():
+            return 'utf-8'
+        
         # For files with ANSI escape codes, try UTF-8 first since most modern logs use UTF-8
         try:
             # Test if sample can be decoded as UTF-8
@@ -285,6 +375,12 @@ class FileHandler:
             pass
         
         # Use chardet as fallback
+        return self._detect_encoding_chardet(sample)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _detect_encoding_chardet(sample: bytes) -> str:
+        """Run chardet on a sample, memoized since viewing the same file repeats the same sample."""
         try:
             result = chardet.detect(sample)
             if result['confidence'] > 0.7:
@@ -306,13 +402,45 @@ class FileHandler:
         Returns:
             Tuple of (success, preview_content, info)
         """
-        success, content, info = self.read_file_safe(file_path)
+        info = self.get_file_info(file_path)
+        error = self._check_readable(info, self.MAX_FILE_SIZE)
+        if error is not None:
+            return False, "", error
         
-        if not success:
-            return False, "", info
+        encoding = info.get("encoding", "utf-8")
+        try:
+            codec_name = codecs.lookup(encoding).name
+        except LookupError:
+            # Leave reporting the unknown encoding to the full read
+            codec_name = None
+        if info["is_compressed"] or codec_name is None or codec_name.startswith(('utf-16', 'utf-32')):
+            # Newlines can't be counted on the raw bytes; decode everything
+            success, content, info = self.read_file_safe(file_path, file_info=info)
+            if not success:
+                return False, "", info
+            total_lines = content.count('\n') + 1
+            at_eof = True
+        else:
+            # Only decode enough of the file for the preview, and count the
+            # remaining lines on the raw bytes
+            head_size = max_chars * 8
+            try:
+                with open(file_path, 'rb', buffering=self.READ_CHUNK_SIZE) as f:
+                    head = f.read(head_size)
+                    at_eof = len(head) < head_size or info["size"] <= head_size
+                    total_lines = head.count(b'\n') + 1
+                    if not at_eof:
+                        self._hint_sequential(f.fileno(), info["size"])
+                        for chunk in iter(lambda: f.read(self.READ_CHUNK_SIZE), b''):
+                            total_lines += chunk.count(b'\n')
+            except Exception as e:
+                logger.error("Read error: %s", e)
+                return False, "", {"error": str(e)}
+            decoder = codecs.getincrementaldecoder(codec_name)(errors='replace')
+            content = decoder.decode(head.replace(b'\x00', b'\xef\xbf\xbd'), final=at_eof)
         
         # Take first few lines
-        lines = content.split('\n')[:max_lines]
+        lines = content.split('\n', max_lines)[:max_lines]
         preview = '\n'.join(lines)
         
         # Truncate if too long
@@ -321,8 +449,8 @@ class FileHandler:
         
         # Add preview info
         info["preview_lines"] = len(lines)
-        info["total_lines"] = content.count('\n') + 1
-        info["is_truncated"] = len(content) > len(preview)
+        info["total_lines"] = total_lines
+        info["is_truncated"] = not at_eof or len(content) > len(preview)
         
         return True, preview, info
     
@@ -353,4 +481,23 @@ class FileHandler:
         if file_info["size"] > self.MAX_FILE_SIZE:
             return False, f"File too large ({file_info['size_human']})", file_info
         
-        return True, "File is valid for viewing", file_info 
\ No newline at end of file
+        return True, "File is valid for viewing", file_info
+    
+    @classmethod
+    def validate_files(cls, file_paths: List[str], max_workers: Optional[int] = None) -> Dict[str, Tuple[bool, str, Dict[str, Any]]]:
+        """
+        Validate many files for viewing at once.
+        
+        The stat and sample reads release the GIL, so running them on a
+        thread pool overlaps the I/O for large batches of files.
+        
+        Args:
+            file_paths: Paths of the files to validate
+            max_workers: Thread pool size (defaults to ThreadPoolExecutor's)
+            
+        Returns:
+            Dictionary mapping each path to its (is_valid, reason, info)
+        """
+        handler = cls()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return dict(zip(file_paths, executor.map(handler.validate_file_for_viewing, file_paths)))
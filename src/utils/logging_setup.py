@@ -7,6 +7,15 @@ from typing import List
 
 from .custom_formatter import CustomFormatter
 
+# None of the log formats use thread or process details, so skip collecting
+# them for every record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+# Console and file handlers shared by every protokoll logger
+_handlers: List[logging.Handler] = []
+
 def _cleanup_old_logs(log_dir: Path, logger: logging.Logger) -> None:
     """
     Clean up log files that are older than 30 days if there are more than 10 log files.
@@ -57,11 +66,19 @@ def get_logger(module_name: str) -> logging.Logger:
     if logger.handlers:
         return logger
 
+    # Reuse the handlers created for the first logger rather than opening
+    # another handle on the same log file
+    if _handlers:
+        for handler in _handlers:
+            logger.addHandler(handler)
+        return logger
+
     # create console handler with a higher log level
     ch: logging.StreamHandler = logging.StreamHandler()
     ch.setLevel(logging.DEBUG)
     ch.setFormatter(CustomFormatter())
     logger.addHandler(ch)
+    _handlers.append(ch)
 
     # Create log file in ApplicationData
     appdata_dir: str = os.getenv('APPDATA') if sys.platform == 'win32' else os.path.expanduser('~/.local/share')
@@ -79,6 +96,7 @@ def get_logger(module_name: str) -> logging.Logger:
     fh.setLevel(logging.DEBUG)
     fh.setFormatter(CustomFormatter())
     logger.addHandler(fh)
+    _handlers.append(fh)
 
     return logger
 
@@ -1,8 +1,27 @@
-import re
+import functools
+import string
 
 from PyQt6.QtGui import QPalette, QColor
 
 
+def _dim_hex(color):
+    """Dim a color by reducing its brightness"""
+    # Only #rrggbb colors can be dimmed
+    if not color or len(color) != 7 or color[0] != '#' or color[1:].lstrip(string.hexdigits):
+        return color
+    
+    # Parse the hex color in one go and split out the channels
+    value = int(color[1:], 16)
+    
+    # Dim the color by reducing brightness (80%); x * 205 >> 8 matches
+    # int(x * 0.8) for every channel value 0-255
+    r = ((value >> 16) * 205) >> 8
+    g = (((value >> 8) & 0xff) * 205) >> 8
+    b = ((value & 0xff) * 205) >> 8
+    
+    return f"#{(r << 16) | (g << 8) | b:06x}"
+
+
 class ThemeManager:
     # Dark theme colors
     DARK_THEME = {
@@ -95,34 +114,150 @@ class ThemeManager:
         107: "#ffffff", # Bright White
     }
     
+    # Foreground and background codes don't overlap, so one lookup serves both
+    ANSI_ALL = {**ANSI_COLORS, **ANSI_BG_COLORS}
+    
+    # Preformatted CSS declarations for the standard codes
+    ANSI_CSS_FG = {code: f"color: {color}" for code, color in ANSI_COLORS.items()}
+    ANSI_CSS_BG = {code: f"background-color: {color}" for code, color in ANSI_BG_COLORS.items()}
+    
+    # Longest text convert_ansi_to_html memoizes
+    ANSI_CACHE_MAX_LENGTH = 4096
+    
+    # What each SGR parameter does, so parsing is one lookup per parameter
+    # rather than a chain of range checks. 38 and 48 read further parameters.
+    _SGR_ACTIONS = {
+        0: ("reset", None),
+        1: ("bold", True),
+        22: ("bold", False),
+        38: ("extended_fg", None),
+        39: ("fg", None),
+        48: ("extended_bg", None),
+        49: ("bg", None),
+        **{code: ("fg", css) for code, css in ANSI_CSS_FG.items()},
+        **{code: ("bg", css) for code, css in ANSI_CSS_BG.items()},
+    }
+    
+    # Standard foreground colors with the ;20 dimming already applied
+    _DIMMED_CSS_FG = {code: f"color: {_dim_hex(color)}" for code, color in ANSI_COLORS.items()}
+    
+    # CSS for the 16 standard 8-bit color indexes. Indexes 8-15 land past the
+    # bright codes and so resolve to the defaults, as the old remapping did.
+    _8BIT_CSS_FG = tuple(map(
+        ANSI_CSS_FG.get,
+        [30 + (i % 8) + (90 if i >= 8 else 0) for i in range(16)],
+        ["color: #ffffff"] * 16,
+    ))
+    _8BIT_CSS_BG = tuple(map(
+        ANSI_CSS_BG.get,
+        [40 + (i % 8) + (100 if i >= 8 else 0) for i in range(16)],
+        ["background-color: #000000"] * 16,
+    ))
+    
+    # Palette colors, parsed once rather than on every apply_dark_theme call
+    _PALETTE_COLORS = (
+        (QPalette.ColorRole.Window, QColor(DARK_THEME["window"])),
+        (QPalette.ColorRole.WindowText, QColor(DARK_THEME["window_text"])),
+        (QPalette.ColorRole.Base, QColor(DARK_THEME["base"])),
+        (QPalette.ColorRole.AlternateBase, QColor(DARK_THEME["alternate_base"])),
+        (QPalette.ColorRole.Text, QColor(DARK_THEME["text"])),
+        (QPalette.ColorRole.Button, QColor(DARK_THEME["button"])),
+        (QPalette.ColorRole.ButtonText, QColor(DARK_THEME["button_text"])),
+        (QPalette.ColorRole.BrightText, QColor(DARK_THEME["bright_text"])),
+        (QPalette.ColorRole.Highlight, QColor(DARK_THEME["highlight"])),
+        (QPalette.ColorRole.HighlightedText, QColor(DARK_THEME["highlight_text"])),
+        (QPalette.ColorRole.Link, QColor(DARK_THEME["link"])),
+        (QPalette.ColorRole.Mid, QColor(DARK_THEME["mid"])),
+        (QPalette.ColorRole.Dark, QColor(DARK_THEME["dark"])),
+        (QPalette.ColorRole.Shadow, QColor(DARK_THEME["shadow"])),
+    )
+    
+    # Dialog stylesheet with a placeholder for each DARK_THEME["dialog"] value,
+    # so themes can fill it in without re-parsing the CSS
+    _DIALOG_STYLE_TEMPLATE = string.Template("""
+            QDialog {
+                background-color: $background;
+            }
+            
+            #dialogHeader {
+                color: $header_color;
+                font-size: $header_font_size;
+                font-weight: bold;
+                margin-bottom: 10px;
+            }
+            
+            QLabel {
+                color: $input_color;
+                font-size: 12px;
+            }
+            
+            QLineEdit, QTextEdit {
+                background-color: $input_background;
+                color: $input_color;
+                border: 1px solid $input_border;
+                border-radius: 4px;
+                padding: 4px 8px;
+            }
+            
+            QLineEdit:focus, QTextEdit:focus {
+                border: 1px solid $input_focus_border;
+            }
+            
+            QLineEdit::placeholder, QTextEdit::placeholder {
+                color: #808080;
+            }
+            
+            #createButton, #cancelButton {
+                background-color: $button_background;
+                color: $button_color;
+                border: 1px solid $button_border;
+                border-radius: 4px;
+                padding: 6px 12px;
+            }
+            
+            #createButton:hover, #cancelButton:hover {
+                background-color: $button_hover;
+            }
+            
+            #createButton:pressed, #cancelButton:pressed {
+                background-color: $button_pressed;
+            }
+            
+            #createButton {
+                background-color: $primary_button_background;
+            }
+            
+            #createButton:hover {
+                background-color: $primary_button_hover;
+            }
+            
+            #createButton:pressed {
+                background-color: $primary_button_pressed;
+            }
+        """)
+    
+    # Dark palette, built on first use and shared after that
+    _palette = None
+    
     @classmethod
     def apply_dark_theme(cls, app):
         """Apply dark theme to the application"""
-        palette = QPalette()
-        
-        # Set colors
-        palette.setColor(QPalette.ColorRole.Window, QColor(cls.DARK_THEME["window"]))
-        palette.setColor(QPalette.ColorRole.WindowText, QColor(cls.DARK_THEME["window_text"]))
-        palette.setColor(QPalette.ColorRole.Base, QColor(cls.DARK_THEME["base"]))
-        palette.setColor(QPalette.ColorRole.AlternateBase, QColor(cls.DARK_THEME["alternate_base"]))
-        palette.setColor(QPalette.ColorRole.Text, QColor(cls.DARK_THEME["text"]))
-        palette.setColor(QPalette.ColorRole.Button, QColor(cls.DARK_THEME["button"]))
-        palette.setColor(QPalette.ColorRole.ButtonText, QColor(cls.DARK_THEME["button_text"]))
-        palette.setColor(QPalette.ColorRole.BrightText, QColor(cls.DARK_THEME["bright_text"]))
-        palette.setColor(QPalette.ColorRole.Highlight, QColor(cls.DARK_THEME["highlight"]))
-        palette.setColor(QPalette.ColorRole.HighlightedText, QColor(cls.DARK_THEME["highlight_text"]))
-        palette.setColor(QPalette.ColorRole.Link, QColor(cls.DARK_THEME["link"]))
-        palette.setColor(QPalette.ColorRole.Mid, QColor(cls.DARK_THEME["mid"]))
-        palette.setColor(QPalette.ColorRole.Dark, QColor(cls.DARK_THEME["dark"]))
-        palette.setColor(QPalette.ColorRole.Shadow, QColor(cls.DARK_THEME["shadow"]))
+        if cls._palette is None:
+            palette = QPalette()
+            
+            # Set colors
+            for role, color in cls._PALETTE_COLORS:
+                palette.setColor(role, color)
+            cls._palette = palette
         
         # Apply palette
-        app.setPalette(palette)
+        app.setPalette(cls._palette)
         
         # Set stylesheet for additional styling
         app.setStyleSheet(cls.get_global_style())
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_global_style(cls) -> str:
         """Get the global stylesheet for the application"""
         return """
@@ -176,6 +311,7 @@ class ThemeManager:
         """
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_log_viewer_style(cls) -> str:
         """Get the stylesheet for the log viewer"""
         return f"""
@@ -189,271 +325,285 @@ class ThemeManager:
         """
     
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def get_dialog_style(cls) -> str:
         """Get the stylesheet for dialogs"""
         dialog = cls.DARK_THEME["dialog"]
-        return f"""
-            QDialog {{
-                background-color: {dialog["background"]};
-            }}
-            
-            #dialogHeader {{
-                color: {dialog["header"]["color"]};
-                font-size: {dialog["header"]["font_size"]};
-                font-weight: bold;
-                margin-bottom: 10px;
-            }}
-            
-            QLabel {{
-                color: {dialog["input"]["color"]};
-                font-size: 12px;
-            }}
-            
-            QLineEdit, QTextEdit {{
-                background-color: {dialog["input"]["background"]};
-                color: {dialog["input"]["color"]};
-                border: 1px solid {dialog["input"]["border"]};
-                border-radius: 4px;
-                padding: 4px 8px;
-            }}
-            
-            QLineEdit:focus, QTextEdit:focus {{
-                border: 1px solid {dialog["input"]["focus_border"]};
-            }}
-            
-            QLineEdit::placeholder, QTextEdit::placeholder {{
-                color: #808080;
-            }}
-            
-            #createButton, #cancelButton {{
-                background-color: {dialog["button"]["background"]};
-                color: {dialog["button"]["color"]};
-                border: 1px solid {dialog["button"]["border"]};
-                border-radius: 4px;
-                padding: 6px 12px;
-            }}
-            
-            #createButton:hover, #cancelButton:hover {{
-                background-color: {dialog["button"]["hover"]};
-            }}
-            
-            #createButton:pressed, #cancelButton:pressed {{
-                background-color: {dialog["button"]["pressed"]};
-            }}
-            
-            #createButton {{
-                background-color: {dialog["primary_button"]["background"]};
-            }}
-            
-            #createButton:hover {{
-                background-color: {dialog["primary_button"]["hover"]};
-            }}
-            
-            #createButton:pressed {{
-                background-color: {dialog["primary_button"]["pressed"]};
-            }}
-        """ 
+        return cls._DIALOG_STYLE_TEMPLATE.substitute(
+            background=dialog["background"],
+            header_color=dialog["header"]["color"],
+            header_font_size=dialog["header"]["font_size"],
+            input_color=dialog["input"]["color"],
+            input_background=dialog["input"]["background"],
+            input_border=dialog["input"]["border"],
+            input_focus_border=dialog["input"]["focus_border"],
+            button_background=dialog["button"]["background"],
+            button_color=dialog["button"]["color"],
+            button_border=dialog["button"]["border"],
+            button_hover=dialog["button"]["hover"],
+            button_pressed=dialog["button"]["pressed"],
+            primary_button_background=dialog["primary_button"]["background"],
+            primary_button_hover=dialog["primary_button"]["hover"],
+            primary_button_pressed=dialog["primary_button"]["pressed"],
+        ) 
 
 
     @staticmethod
     def convert_ansi_to_html(text):
         """Convert ANSI color codes to HTML formatting"""
+        # Most log text has no escapes at all. It's returned unchanged (not
+        # with <br> line breaks) so QTextEdit.append keeps treating it as
+        # plain text rather than HTML.
+        if '\x1b' not in text:
+            return text
+        
+        # Short texts, like single lines in search results, are often
+        # converted again; whole files and chunks are not worth keeping
+        if len(text) <= ThemeManager.ANSI_CACHE_MAX_LENGTH:
+            return ThemeManager._scan_ansi_cached(text)
+        return ThemeManager._scan_ansi(text)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def _scan_ansi_cached(text):
+        """Memoized _scan_ansi for short texts"""
+        return ThemeManager._scan_ansi(text)
+
+    @staticmethod
+    def _scan_ansi(text):
+        """Render the ANSI SGR sequences in text as HTML spans"""
         # ANSI color code patterns
         # Reset: \x1b[0m
         # Color codes: \x1b[38;2;r;g;bm (24-bit) or \x1b[38;5;nm (8-bit) or \x1b[38;nm (standard)
         # Background codes: \x1b[48;2;r;g;bm (24-bit) or \x1b[48;5;nm (8-bit) or \x1b[48;nm (standard)
+        #
+        # Single pass: jump from one escape sequence to the next with str.find,
+        # parse the parameters by hand, and reset styling at each newline.
         
-        # Use centralized color constants from theme manager
-        ansi_colors = ThemeManager.ANSI_COLORS
-        ansi_bg_colors = ThemeManager.ANSI_BG_COLORS
+        # Fragments are appended as they are and joined once at the end
+        parts = []
+        append = parts.append
+        extend = parts.extend
+        length = len(text)
         
-        # Check if we have ANSI codes
-        ansi_pattern = r'\x1b\[[0-9;]*[a-zA-Z]'
-        if not re.search(ansi_pattern, text):
-            return text
+        # Track current styling
+        current_fg = None
+        current_bg = None
+        current_bold = False
+        open_tag = ""
         
-        # Split text into lines to process each line separately
-        lines = text.split('\n')
-        processed_lines = []
+        # Text is collected into runs of identical styling, so codes that
+        # don't change anything visible don't split it into extra spans
+        run = []
+        run_tag = ""
         
-        for line in lines:
-            # Split the line into segments based on ANSI codes
-            ansi_pattern = r'\x1b\[([0-9;]*)m'
-            
-            # Find all ANSI codes and their positions
-            matches = list(re.finditer(ansi_pattern, line))
-            if not matches:
-                # No ANSI codes, just return the line as plain text
-                processed_lines.append(line)
+        def close_run():
+            if run:
+                if run_tag:
+                    append(run_tag)
+                    extend(run)
+                    append('</span>')
+                else:
+                    extend(run)
+                run.clear()
+        
+        # One parameter list, cleared and refilled for every sequence
+        code_parts = []
+        add_code = code_parts.append
+        
+        found_sequence = False
+        segment_start = 0  # Start of text not yet written to parts
+        search_from = 0
+        
+        while True:
+            # A single-character find is a plain memchr scan
+            esc = text.find('\x1b', search_from)
+            if esc < 0:
+                break
+            if text[esc + 1:esc + 2] != '[':
+                search_from = esc + 1
                 continue
             
-
+            # Read the parameters: digits separated by semicolons
+            code_parts.clear()
+            value = 0
+            end = esc + 2
+            char = ''
+            while end < length:
+                char = text[end]
+                if '0' <= char <= '9':
+                    value = value * 10 + ord(char) - 48
+                elif char == ';':
+                    add_code(value)
+                    value = 0
+                else:
+                    break
+                end += 1
+            else:
+                break  # Ran off the end without a final byte
             
-            # Track current styling
-            current_fg = None
-            current_bg = None
-            current_bold = False
+            if not ('a' <= char <= 'z' or 'A' <= char <= 'Z'):
+                # Not a complete sequence, leave it in the text
+                search_from = end
+                continue
             
-            # Build the HTML line by processing each segment
-            html_parts = []
-            last_end = 0
+            found_sequence = True
+            search_from = end + 1
+            if char != 'm':
+                # Only SGR sequences are rendered; keep others as text
+                continue
+            add_code(value)
             
-            for match in matches:
-                # Add text before this ANSI code
-                if match.start() > last_end:
-                    text_segment = line[last_end:match.start()]
-                    if text_segment:
-                        # Apply current styling to this text segment
-                        style_parts = []
-                        if current_fg:
-                            style_parts.append(f"color: {current_fg}")
-                        if current_bg:
-                            style_parts.append(f"background-color: {current_bg}")
-                        if current_bold:
-                            style_parts.append("font-weight: bold")
-                        
-                        if style_parts:
-                            style = "; ".join(style_parts)
-                            html_parts.append(f'<span style="{style}">{text_segment}</span>')
-                        else:
-                            html_parts.append(text_segment)
-                
-                # Process the ANSI code
-                code_str = match.group(1)
-                
-                if not code_str:  # Reset code [0m
+            # Add text before this ANSI code
+            if esc > segment_start:
+                segment = text[segment_start:esc]
+                if open_tag != run_tag:
+                    close_run()
+                    run_tag = open_tag
+                first_break = segment.find('\n')
+                if first_break >= 0:
+                    # Styling doesn't carry over line breaks
+                    if first_break:
+                        run.append(segment[:first_break])
+                    close_run()
+                    last_break = segment.rfind('\n')
+                    append(segment[first_break:last_break + 1].replace('\n', '<br>'))
+                    run_tag = ""
+                    if last_break + 1 < len(segment):
+                        run.append(segment[last_break + 1:])
                     current_fg = None
                     current_bg = None
                     current_bold = False
                 else:
-                    # Parse the code string
-                    code_parts = [int(x) if x else 0 for x in code_str.split(';')]
-                    
-                    i = 0
-                    while i < len(code_parts):
-                        code = code_parts[i]
-                        
-                        if code == 0:  # Reset
-                            current_fg = None
-                            current_bg = None
-                            current_bold = False
-                        elif code == 1:  # Bold
-                            current_bold = True
-                        elif code == 22:  # Normal intensity
-                            current_bold = False
-                        elif 30 <= code <= 37 or 90 <= code <= 97:  # Foreground colors
-                            current_fg = ansi_colors.get(code, "#ffffff")
-                            # Check if there's a modifier code (like ;20) following
-                            if i + 1 < len(code_parts) and code_parts[i + 1] == 20:
-                                # Apply a dimming effect for the ;20 modifier
-                                if current_fg:
-                                    # Make the color slightly dimmer
-                                    current_fg = ThemeManager._dim_color(current_fg)
-                                i += 1  # Skip the modifier code
-                        elif 40 <= code <= 47 or 100 <= code <= 107:  # Background colors
-                            current_bg = ansi_bg_colors.get(code, "#000000")
-                        elif code == 38:  # Extended foreground color
-                            # Check if next code is 5 (8-bit color) or 2 (24-bit color)
-                            if i + 1 < len(code_parts):
-                                next_code = code_parts[i + 1]
-                                if next_code == 5 and i + 2 < len(code_parts):  # 8-bit color
-                                    color_code = code_parts[i + 2]
-                                    # Map 8-bit colors to our color palette
-                                    if 0 <= color_code <= 15:  # Standard colors
-                                        current_fg = ansi_colors.get(30 + (color_code % 8) + (90 if color_code >= 8 else 0), "#ffffff")
-                                    i += 2  # Skip the next two codes
-                                elif next_code == 2 and i + 4 < len(code_parts):  # 24-bit color
-                                    # Extract RGB values
-                                    r, g, b = code_parts[i + 2], code_parts[i + 3], code_parts[i + 4]
-                                    current_fg = f"#{r:02x}{g:02x}{b:02x}"
-                                    i += 4  # Skip the next four codes
-                                else:  # Handle non-standard extended color format (like 38;20)
-                                    # Treat the next code as a simple color index
-                                    color_code = next_code
-                                    # Map to a reasonable color based on the code
-                                    if color_code == 20:
-                                        current_fg = "#d4d4d4"  # Light gray for code 20 (matches the custom formatter's grey)
-                                    elif 0 <= color_code <= 15:
-                                        # Map to standard ANSI colors
-                                        current_fg = ansi_colors.get(30 + (color_code % 8) + (90 if color_code >= 8 else 0), "#ffffff")
-                                    else:
-                                        # Default to white for unknown codes
-                                        current_fg = "#ffffff"
-                                    i += 1  # Skip the next code
-                            else:
-                                i += 1  # Skip the next code
-                        elif code == 48:  # Extended background color
-                            # Similar handling as foreground
-                            if i + 1 < len(code_parts):
-                                next_code = code_parts[i + 1]
-                                if next_code == 5 and i + 2 < len(code_parts):  # 8-bit color
-                                    color_code = code_parts[i + 2]
-                                    if 0 <= color_code <= 15:  # Standard colors
-                                        current_bg = ansi_bg_colors.get(40 + (color_code % 8) + (100 if color_code >= 8 else 0), "#000000")
-                                    i += 2  # Skip the next two codes
-                                elif next_code == 2 and i + 4 < len(code_parts):  # 24-bit color
-                                    r, g, b = code_parts[i + 2], code_parts[i + 3], code_parts[i + 4]
-                                    current_bg = f"#{r:02x}{g:02x}{b:02x}"
-                                    i += 4  # Skip the next four codes
-                                else:
-                                    i += 1
-                            else:
-                                i += 1
-                        elif code == 39:  # Default foreground
-                            current_fg = None
-                        elif code == 49:  # Default background
-                            current_bg = None
-                        else:
-                            # Unknown code, log it for debugging
-                            # logger.debug(f"Unknown ANSI code: {code}")
-                            pass
-                        
-                        i += 1
-                
-                last_end = match.end()
+                    run.append(segment)
+            segment_start = search_from
             
-            # Add any remaining text after the last ANSI code
-            if last_end < len(line):
-                text_segment = line[last_end:]
-                if text_segment:
-                    # Apply current styling to this text segment
-                    style_parts = []
-                    if current_fg:
-                        style_parts.append(f"color: {current_fg}")
-                    if current_bg:
-                        style_parts.append(f"background-color: {current_bg}")
-                    if current_bold:
-                        style_parts.append("font-weight: bold")
-                    
-                    if style_parts:
-                        style = "; ".join(style_parts)
-                        html_parts.append(f'<span style="{style}">{text_segment}</span>')
-                    else:
-                        html_parts.append(text_segment)
+            # Process the ANSI code
+            current_fg, current_bg, current_bold = ThemeManager._apply_sgr_codes(
+                code_parts, current_fg, current_bg, current_bold)
             
-            # Join all HTML parts (these are on the same line)
-            html_line = ''.join(html_parts)
-            processed_lines.append(html_line)
+            style_parts = []
+            if current_fg:
+                style_parts.append(current_fg)
+            if current_bg:
+                style_parts.append(current_bg)
+            if current_bold:
+                style_parts.append("font-weight: bold")
+            open_tag = f'<span style="{"; ".join(style_parts)}">' if style_parts else ""
         
-        return '<br>'.join(processed_lines)
+        # No ANSI codes, return the text as is
+        if not found_sequence:
+            return text
+        
+        # Add any remaining text after the last ANSI code
+        if segment_start < length:
+            segment = text[segment_start:]
+            first_break = segment.find('\n')
+            if open_tag != run_tag:
+                close_run()
+                run_tag = open_tag
+            if first_break < 0:
+                run.append(segment)
+                close_run()
+            else:
+                if first_break:
+                    run.append(segment[:first_break])
+                close_run()
+                append(segment[first_break:].replace('\n', '<br>'))
+        else:
+            close_run()
+        
+        return ''.join(parts)
 
     @staticmethod
-    def _dim_color(color):
-        """Dim a color by reducing its brightness"""
-        if not color or not color.startswith('#'):
-            return color
+    def _apply_sgr_codes(code_parts, current_fg, current_bg, current_bold):
+        """Apply the parameters of one SGR sequence to the current styling"""
+        # Use centralized color constants from theme manager
+        dimmed_fg = ThemeManager._DIMMED_CSS_FG
+        eight_bit_fg = ThemeManager._8BIT_CSS_FG
+        eight_bit_bg = ThemeManager._8BIT_CSS_BG
         
-        try:
-            # Parse the hex color
-            r = int(color[1:3], 16)
-            g = int(color[3:5], 16)
-            b = int(color[5:7], 16)
+        sgr_actions = ThemeManager._SGR_ACTIONS
+        
+        i = 0
+        while i < len(code_parts):
+            code = code_parts[i]
+            action = sgr_actions.get(code)
+            if action is None:
+                # Unknown code, log it for debugging
+                # logger.debug(f"Unknown ANSI code: {code}")
+                i += 1
+                continue
             
-            # Dim the color by reducing brightness (80%)
-            r = int(r * 0.8)
-            g = int(g * 0.8)
-            b = int(b * 0.8)
+            kind, value = action
+            if kind == "fg":  # Foreground colors, or 39 for the default
+                current_fg = value
+                # Check if there's a modifier code (like ;20) following
+                if value and i + 1 < len(code_parts) and code_parts[i + 1] == 20:
+                    # Apply a dimming effect for the ;20 modifier
+                    current_fg = dimmed_fg[code]
+                    i += 1  # Skip the modifier code
+            elif kind == "reset":
+                current_fg = None
+                current_bg = None
+                current_bold = False
+            elif kind == "bg":  # Background colors, or 49 for the default
+                current_bg = value
+            elif kind == "bold":  # Bold, or 22 for normal intensity
+                current_bold = value
+            elif kind == "extended_fg":  # Extended foreground color
+                # Check if next code is 5 (8-bit color) or 2 (24-bit color)
+                if i + 1 < len(code_parts):
+                    next_code = code_parts[i + 1]
+                    if next_code == 5 and i + 2 < len(code_parts):  # 8-bit color
+                        color_code = code_parts[i + 2]
+                        # Map 8-bit colors to our color palette
+                        if color_code < 16:  # Standard colors
+                            current_fg = eight_bit_fg[color_code]
+                        i += 2  # Skip the next two codes
+                    elif next_code == 2 and i + 4 < len(code_parts):  # 24-bit color
+                        # Extract RGB values
+                        r, g, b = code_parts[i + 2], code_parts[i + 3], code_parts[i + 4]
+                        current_fg = f"color: #{r:02x}{g:02x}{b:02x}"
+                        i += 4  # Skip the next four codes
+                    else:  # Handle non-standard extended color format (like 38;20)
+                        # Treat the next code as a simple color index
+                        color_code = next_code
+                        # Map to a reasonable color based on the code
+                        if color_code == 20:
+                            current_fg = "color: #d4d4d4"  # Light gray for code 20 (matches the custom formatter's grey)
+                        elif color_code < 16:
+                            # Map to standard ANSI colors
+                            current_fg = eight_bit_fg[color_code]
+                        else:
+                            # Default to white for unknown codes
+                            current_fg = "color: #ffffff"
+                        i += 1  # Skip the next code
+                else:
+                    i += 1  # Skip the next code
+            else:  # Extended background color
+                # Similar handling as foreground
+                if i + 1 < len(code_parts):
+                    next_code = code_parts[i + 1]
+                    if next_code == 5 and i + 2 < len(code_parts):  # 8-bit color
+                        color_code = code_parts[i + 2]
+                        if color_code < 16:  # Standard colors
+                            current_bg = eight_bit_bg[color_code]
+                        i += 2  # Skip the next two codes
+                    elif next_code == 2 and i + 4 < len(code_parts):  # 24-bit color
+                        r, g, b = code_parts[i + 2], code_parts[i + 3], code_parts[i + 4]
+                        current_bg = f"background-color: #{r:02x}{g:02x}{b:02x}"
+                        i += 4  # Skip the next four codes
+                    else:
+                        i += 1
+                else:
+                    i += 1
             
-            return f"#{r:02x}{g:02x}{b:02x}"
-        except (ValueError, IndexError):
-            return color
+            i += 1
+        
+        return current_fg, current_bg, current_bold
+
+    @staticmethod
+    def _dim_color(color):
+        """Dim a color by reducing its brightness"""
+        return _dim_hex(color)
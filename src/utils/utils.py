@@ -12,6 +12,11 @@ import traceback
 import unicodedata
 import subprocess
 
+try:
+    from rapidfuzz.distance import Levenshtein  # C++ edit distance
+except ImportError:
+    Levenshtein = None  # Fall back to the pure-Python implementation
+
 from .logging_setup import get_logger
 
 logger = get_logger('utils.utils')
@@ -173,6 +178,9 @@ class Utils:
 
     @staticmethod
     def string_distance(s, t):
+        if Levenshtein is not None:
+            return Levenshtein.distance(s, t)
+
         # create two work vectors of integer distances
         v0 = [0] * (len(t) + 1)
         v1 = [0] * (len(t) + 1)
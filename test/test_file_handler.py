@@ -6,6 +6,7 @@ Simple test script for the FileHandler class.
 import os
 import tempfile
 import gzip
+from unittest import mock
 from src.utils.file_handler import FileHandler
 
 def test_file_handler():
@@ -75,5 +76,137 @@ def test_file_handler():
     
     print("\n✓ All tests completed!")
 
+def test_binary_detection():
+    """Test binary sample classification thresholds"""
+    handler = FileHandler()
+    
+    assert not handler._is_binary_sample(b"")
+    assert not handler._is_binary_sample(b"2024-01-01 INFO started\r\n\tdone\n")
+    
+    # More than 25% null bytes is binary
+    assert handler._is_binary_sample(b"ab\x00")
+    assert not handler._is_binary_sample(b"abc\x00")
+    
+    # Printable ratio under 65% is binary, exactly 65% is not
+    assert handler._is_binary_sample(b"a" * 64 + b"\x01" * 36)
+    assert not handler._is_binary_sample(b"a" * 65 + b"\xff" * 35)
+
+def test_validate_files():
+    """Test batch validation matches validating files one by one"""
+    handler = FileHandler()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        text_file = os.path.join(temp_dir, "app.log")
+        with open(text_file, "w") as f:
+            f.write("2024-01-01 INFO started\n")
+        binary_file = os.path.join(temp_dir, "app.bin")
+        with open(binary_file, "wb") as f:
+            f.write(b"\x00" * 64)
+        missing_file = os.path.join(temp_dir, "missing.log")
+        
+        paths = [text_file, binary_file, missing_file, temp_dir]
+        results = FileHandler.validate_files(paths)
+        
+        assert list(results) == paths
+        for path in paths:
+            assert results[path][:2] == handler.validate_file_for_viewing(path)[:2]
+        assert results[text_file][0]
+        assert not results[binary_file][0]
+        assert not results[missing_file][0]
+
+def test_file_preview():
+    """Test preview line counts and truncation"""
+    handler = FileHandler()
+    
+    def write_temp(data):
+        with tempfile.NamedTemporaryFile(mode='wb', suffix='.log', delete=False) as f:
+            f.write(data)
+            return f.name
+    
+    large_file = write_temp(b"".join(b"line %d\n" % i for i in range(2000)))
+    no_newline_file = write_temp(b"first\nsecond\nthird")
+    utf16_file = write_temp("first\nsecond\nthird\n".encode('utf-16'))
+    unknown_file = write_temp(b"first\nsecond\nthird\n")
+    
+    try:
+        # Larger than the head read of max_chars * 8 bytes
+        success, preview, info = handler.get_file_preview(large_file, max_lines=10, max_chars=100)
+        assert success
+        assert os.path.getsize(large_file) > 100 * 8
+        assert preview == "\n".join(f"line {i}" for i in range(10))
+        assert info["preview_lines"] == 10
+        assert info["total_lines"] == 2001
+        assert info["is_truncated"]
+        
+        success, preview, info = handler.get_file_preview(no_newline_file)
+        assert success
+        assert preview == "first\nsecond\nthird"
+        assert info["preview_lines"] == 3
+        assert info["total_lines"] == 3
+        assert not info["is_truncated"]
+        
+        # UTF-16 samples contain null bytes, so skip binary detection; the
+        # preview must agree with a full read of the file
+        with mock.patch.object(FileHandler, '_is_binary_sample', return_value=False):
+            success, preview, info = handler.get_file_preview(utf16_file, max_lines=2)
+            _, content, _ = handler.read_file_safe(utf16_file)
+        lines = content.split('\n')[:2]
+        assert success
+        assert info["encoding"] == 'utf-16'
+        assert preview == "\n".join(lines)
+        assert info["preview_lines"] == len(lines)
+        assert info["total_lines"] == content.count('\n') + 1
+        assert info["is_truncated"] == (len(content) > len(preview))
+        
+        # Unknown encodings are reported rather than raised
+        with mock.patch.object(FileHandler, '_detect_encoding', return_value='EUC-TW'):
+            success, preview, info = handler.get_file_preview(unknown_file)
+            assert (success, preview, info) == handler.read_file_safe(unknown_file)
+        assert not success
+        assert "error" in info
+    finally:
+        for path in (large_file, no_newline_file, utf16_file, unknown_file):
+            os.unlink(path)
+
+def test_file_info_cache():
+    """Test that file info is reused only while the file is unchanged"""
+    handler = FileHandler()
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.log', delete=False) as f:
+        f.write("first line\n")
+        test_file = f.name
+    
+    try:
+        with mock.patch.object(FileHandler, '_is_binary_sample', autospec=True,
+                               side_effect=FileHandler._is_binary_sample) as sample_check:
+            info = handler.get_file_info(test_file)
+            assert sample_check.call_count == 1
+            
+            # Unchanged file hits the cache
+            assert handler.get_file_info(test_file) == info
+            assert sample_check.call_count == 1
+            
+            # Changed file misses it
+            with open(test_file, 'a') as f:
+                f.write("second line\n")
+            changed = handler.get_file_info(test_file)
+            assert sample_check.call_count == 2
+            assert changed["size"] > info["size"]
+        
+        # A failed sample read is not cached
+        os.utime(test_file, ns=(0, 0))
+        with mock.patch('os.open', side_effect=OSError("Resource busy")):
+            failed = handler.get_file_info(test_file)
+        assert "Binary detection failed" in failed["warnings"]
+        recovered = handler.get_file_info(test_file)
+        assert not recovered["is_binary"]
+        assert "Binary detection failed" not in recovered["warnings"]
+    finally:
+        os.unlink(test_file)
+
 if __name__ == "__main__":
-    test_file_handler() 
\ No newline at end of file
+    test_file_handler()
+    test_binary_detection()
+    test_validate_files() 
+    test_file_preview()
+    test_file_info_cache()
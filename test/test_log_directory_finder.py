@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Simple test script for the LogDirectoryFinder class.
+"""
+
+import os
+import tempfile
+from src.internal.log_directory_finder import LogDirectoryFinder
+
+def _make_dir(path, files=()):
+    os.makedirs(path, exist_ok=True)
+    for name in files:
+        with open(os.path.join(path, name), 'w') as f:
+            f.write("log line\n")
+
+def test_match_near_depth_limit():
+    """Test that matches resolve log files the depth-limited walk never reaches"""
+    with tempfile.TemporaryDirectory() as base:
+        # Logs sit below max_depth relative to the base directory
+        deep = os.path.join(base, 'Vendor', 'Suite', 'MyTool')
+        _make_dir(os.path.join(deep, 'logs', '2024'), ['run.log'])
+        # Logs sit in a directory the walk skips
+        skipped = os.path.join(base, 'Other', 'MyTool3')
+        _make_dir(os.path.join(skipped, 'Cache'), ['x.log'])
+        # No logs anywhere below the match
+        empty = os.path.join(base, 'Empty', 'MyTool')
+        _make_dir(os.path.join(empty, 'docs'), ['readme.md'])
+        
+        matches, _ = LogDirectoryFinder._search_base_dirs(
+            [base], lambda dir_path, dir_name_lower: dir_name_lower in ('mytool', 'mytool3'), 3)
+        
+        assert matches == {deep: True, skipped: True, empty: False}
+
+def test_scan_cache_invalidation():
+    """Test that cached listings are dropped when the tree changes"""
+    def search(base):
+        matches, _ = LogDirectoryFinder._search_base_dirs(
+            [base], lambda dir_path, dir_name_lower: dir_name_lower == 'mytool', 3)
+        return matches
+    
+    with tempfile.TemporaryDirectory() as base:
+        tool = os.path.join(base, 'Vendor', 'MyTool')
+        _make_dir(tool, ['run.log'])
+        assert search(base) == {tool: True}
+        
+        # Unchanged tree reuses the cached listing
+        cached = LogDirectoryFinder._scan_cache[(base, 3)]
+        assert search(base) == {tool: True}
+        assert LogDirectoryFinder._scan_cache[(base, 3)] is cached
+        
+        # Removing the log
+        os.remove(os.path.join(tool, 'run.log'))
+        assert search(base) == {tool: False}
+        
+        # Adding a log
+        _make_dir(tool, ['new.log'])
+        assert search(base) == {tool: True}
+        
+        # Adding a directory
+        other = os.path.join(base, 'Other', 'MyTool')
+        _make_dir(other, ['other.log'])
+        assert search(base) == {tool: True, other: True}
+        
+        # Renaming a directory
+        renamed = os.path.join(base, 'Vendor', 'Renamed')
+        os.rename(tool, renamed)
+        assert search(base) == {other: True}
+        os.rename(renamed, tool)
+        assert search(base) == {tool: True, other: True}
+        
+        # Removing a directory
+        os.remove(os.path.join(other, 'other.log'))
+        os.rmdir(other)
+        assert search(base) == {tool: True}
+
+if __name__ == "__main__":
+    test_match_near_depth_limit()
+    test_scan_cache_invalidation()
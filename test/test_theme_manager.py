@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Simple test script for the ThemeManager ANSI conversion.
+"""
+
+from src.utils.theme_manager import ThemeManager
+
+def test_plain_text():
+    """Test that text without escape sequences is returned unchanged"""
+    text = "plain <text> & more\nsecond line"
+    assert ThemeManager.convert_ansi_to_html(text) == text
+    assert ThemeManager.convert_ansi_to_html("") == ""
+
+def test_line_reset():
+    """Test that styling resets at each newline"""
+    html = ThemeManager.convert_ansi_to_html("\x1b[31mred\nnext")
+    assert html == '<span style="color: #cd3131">red</span><br>next'
+
+def test_bold_and_dimming():
+    """Test bold toggling and ;20 dimming"""
+    html = ThemeManager.convert_ansi_to_html("\x1b[1;32mok\x1b[22m x")
+    assert html == ('<span style="color: #0dbc79; font-weight: bold">ok</span>'
+                    '<span style="color: #0dbc79"> x</span>')
+    
+    html = ThemeManager.convert_ansi_to_html("\x1b[31;20mdim\x1b[0m")
+    assert html == '<span style="color: #a42727">dim</span>'
+
+def test_extended_colors():
+    """Test 8-bit and 24-bit color sequences"""
+    html = ThemeManager.convert_ansi_to_html("\x1b[38;5;1mfg\x1b[48;5;4mbg\x1b[0m")
+    assert html == ('<span style="color: #cd3131">fg</span>'
+                    '<span style="color: #cd3131; background-color: #2472c8">bg</span>')
+    
+    # Indexes 8-15 fall back to the default color
+    html = ThemeManager.convert_ansi_to_html("\x1b[38;5;9mhi\x1b[0m")
+    assert html == '<span style="color: #ffffff">hi</span>'
+    
+    html = ThemeManager.convert_ansi_to_html("\x1b[38;2;255;128;0mrgb\x1b[0m")
+    assert html == '<span style="color: #ff8000">rgb</span>'
+
+def test_non_sgr_sequences():
+    """Test that non-SGR CSI sequences are left in place"""
+    assert ThemeManager.convert_ansi_to_html("\x1b[2Kline") == "\x1b[2Kline"
+
+def test_merged_runs():
+    """Test that adjacent runs with the same style share one span"""
+    html = ThemeManager.convert_ansi_to_html("\x1b[31ma\x1b[31mb\x1b[0m")
+    assert html == '<span style="color: #cd3131">ab</span>'
+
+def test_uncached_text():
+    """Test that text too long to memoize converts the same way"""
+    line = "\x1b[1;34mINFO\x1b[0m message"
+    text = "\n".join([line] * 500)
+    assert len(text) > ThemeManager.ANSI_CACHE_MAX_LENGTH
+    assert ThemeManager.convert_ansi_to_html(text) == "<br>".join(
+        [ThemeManager.convert_ansi_to_html(line)] * 500)
+
+if __name__ == "__main__":
+    test_plain_text()
+    test_line_reset()
+    test_bold_and_dimming()
+    test_extended_colors()
+    test_non_sgr_sequences()
+    test_merged_runs()
+    test_uncached_text()